@@ -13,6 +13,7 @@ from app.log.logger import get_application_logger, setup_access_logging
 from app.middleware.middleware import setup_middlewares
 from app.router.routes import setup_routers
 from app.scheduler.scheduled_tasks import start_scheduler, stop_scheduler
+from app.service.client.api_client import close_http_clients
 from app.service.key.key_manager import get_key_manager_instance
 from app.service.update.update_service import check_for_updates
 from app.utils.helpers import get_current_version
@@ -107,6 +108,7 @@ async def lifespan(app: FastAPI):
 
     logger.info("Application shutting down...")
     _stop_scheduler()
+    await close_http_clients()
     await _shutdown_database()
 
 
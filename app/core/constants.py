@@ -6,6 +6,16 @@
 API_VERSION = "v1beta"
 DEFAULT_TIMEOUT = 300  # 秒
 MAX_RETRIES = 3  # 最大重试次数
+KEY_RATE_LIMIT_COOLDOWN_SECONDS = 60  # key 被限流(429)后的冷却时间，秒
+KEY_REJECTED_STATUS_CODES = (401, 403)  # 视为 key 本身失效的状态码
+RETRY_BACKOFF_BASE_SECONDS = 0.5  # 流式重试退避的基础时间，秒
+RETRY_BACKOFF_MAX_SECONDS = 8.0  # 流式重试退避的上限，秒
+BULK_VERIFY_MAX_CONCURRENCY = 32  # 批量验证密钥时的最大并发数
+KEY_VERIFY_TIMEOUT_SECONDS = 30  # 批量验证时单个密钥的超时时间，秒
+# 共享 httpx 连接池的上限：总连接数不设上限(None)，避免长时间的流式请求占满连接池后
+# 新请求排队等待；空闲 keep-alive 连接最多保留 100 个
+HTTP_CLIENT_MAX_CONNECTIONS = None
+HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = 100
 
 # 模型相关常量
 SUPPORTED_ROLES = ["user", "model", "system"]
@@ -70,6 +80,32 @@ GEMINI_2_FLASH_EXP_SAFETY_SETTINGS = [
     {"category": "HARM_CATEGORY_CIVIC_INTEGRITY", "threshold": "OFF"},
 ]
 
+# Gemini API不支持的JSON Schema字段
+GEMINI_UNSUPPORTED_SCHEMA_FIELDS = frozenset(
+    {
+        "exclusiveMaximum",
+        "exclusiveMinimum",
+        "const",
+        "examples",
+        "contentEncoding",
+        "contentMediaType",
+        "if",
+        "then",
+        "else",
+        "allOf",
+        "anyOf",
+        "oneOf",
+        "not",
+        "definitions",
+        "$schema",
+        "$id",
+        "$ref",
+        "$comment",
+        "readOnly",
+        "writeOnly",
+    }
+)
+
 DEFAULT_SAFETY_SETTINGS = [
     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "OFF"},
     {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "OFF"},
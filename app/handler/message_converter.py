@@ -44,14 +44,12 @@ def _get_mime_type_and_data(base64_string):
     """
     # 检查字符串是否以 "data:" 格式开始
     if base64_string.startswith("data:"):
-        # 提取 MIME 类型和数据
-        pattern = DATA_URL_PATTERN
-        match = re.match(pattern, base64_string)
-        if match:
-            mime_type = (
-                "image/jpeg" if match.group(1) == "image/jpg" else match.group(1)
-            )
-            encoded_data = match.group(2)
+        # 提取 MIME 类型和数据，使用 partition 避免正则扫描整个 base64 负载
+        header, _, encoded_data = base64_string.partition(",")
+        mime_type, _, encoding = header[5:].partition(";")
+        if mime_type and encoding == "base64" and encoded_data:
+            if mime_type == "image/jpg":
+                mime_type = "image/jpeg"
             return mime_type, encoded_data
 
     # 如果不是预期格式，假定它只是数据部分
@@ -1,6 +1,8 @@
 
 from functools import wraps
-from typing import Callable, TypeVar
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
 
 from app.config.config import settings
 from app.log.logger import get_retry_logger
@@ -10,11 +12,20 @@ T = TypeVar("T")
 logger = get_retry_logger()
 
 
+def _get_upstream_status_code(e: Exception) -> Optional[int]:
+    """提取上游错误的状态码，handle_route_errors 会把原始异常包装为 HTTPException"""
+    source = e.__cause__ if isinstance(e, HTTPException) and e.__cause__ else e
+    status_code = source.args[0] if source.args else None
+    return status_code if isinstance(status_code, int) else None
+
+
 class RetryHandler:
     """重试处理装饰器"""
 
-    def __init__(self, key_arg: str = "api_key"):
+    def __init__(self, key_arg: str = "api_key", is_vertex: bool = False):
         self.key_arg = key_arg
+        # Vertex Express 路由的 key 需要交给 Vertex key 池处理失败
+        self.is_vertex = is_vertex
 
     def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -35,7 +46,15 @@ class RetryHandler:
                     key_manager = kwargs.get("key_manager")
                     if key_manager:
                         old_key = kwargs.get(self.key_arg)
-                        new_key = await key_manager.handle_api_failure(old_key, retries)
+                        status_code = _get_upstream_status_code(e)
+                        handle_failure = (
+                            key_manager.handle_vertex_api_failure
+                            if self.is_vertex
+                            else key_manager.handle_api_failure
+                        )
+                        new_key = await handle_failure(
+                            old_key, retries, status_code=status_code
+                        )
                         if new_key:
                             kwargs[self.key_arg] = new_key
                             logger.info(f"Switched to new API key: {redact_key_for_logging(new_key)}")
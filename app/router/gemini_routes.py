@@ -1,11 +1,16 @@
 import asyncio
+import logging
 from copy import deepcopy
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.config.config import settings
-from app.core.constants import API_VERSION
+from app.core.constants import (
+    API_VERSION,
+    BULK_VERIFY_MAX_CONCURRENCY,
+    KEY_VERIFY_TIMEOUT_SECONDS,
+)
 from app.core.security import SecurityService
 from app.domain.gemini_models import (
     GeminiBatchEmbedRequest,
@@ -140,7 +145,8 @@ async def generate_content(
         logger.info(
             f"Handling Gemini content generation request for model: {model_name}"
         )
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
 
         # 检测是否为原生Gemini TTS请求
         is_native_tts = False
@@ -204,7 +210,8 @@ async def stream_generate_content(
         logger.info(
             f"Handling Gemini streaming content generation for model: {model_name}"
         )
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -257,7 +264,8 @@ async def count_tokens(
         logger, operation_name, failure_message="Token counting failed"
     ):
         logger.info(f"Handling Gemini token count request for model: {model_name}")
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -289,7 +297,8 @@ async def embed_content(
         logger, operation_name, failure_message="Embedding content generation failed"
     ):
         logger.info(f"Handling Gemini embedding request for model: {model_name}")
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -323,7 +332,8 @@ async def batch_embed_contents(
         failure_message="Batch embedding content generation failed",
     ):
         logger.info(f"Handling Gemini batch embedding request for model: {model_name}")
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -508,12 +518,11 @@ async def verify_key(
     except Exception as e:
         logger.error(f"Key verification failed: {str(e)}")
 
-        async with key_manager.failure_count_lock:
-            if api_key in key_manager.key_failure_counts:
-                key_manager.key_failure_counts[api_key] += 1
-                logger.warning(
-                    f"Verification exception for key: {redact_key_for_logging(api_key)}, incrementing failure count"
-                )
+        if api_key in key_manager.key_failure_counts:
+            key_manager.increment_key_failure_count(api_key)
+            logger.warning(
+                f"Verification exception for key: {redact_key_for_logging(api_key)}, incrementing failure count"
+            )
 
         return JSONResponse({"status": "invalid", "error": e.args[1]})
 
@@ -539,45 +548,73 @@ async def verify_selected_keys(
     successful_keys = []
     failed_keys = {}
 
+    # 所有密钥共用同一个测试请求，_build_payload 每次都会基于它生成新的 payload
+    gemini_request = GeminiRequest(
+        contents=[GeminiContent(role="user", parts=[{"text": "hi"}])],
+        generation_config={
+            "temperature": 0.7,
+            "topP": 1.0,
+            "maxOutputTokens": 10,
+        },
+    )
+
+    def _record_verification_failure(api_key: str, error_code, error_message: str):
+        """记录单个密钥验证失败：增加失败计数并写入失败结果"""
+        logger.warning(
+            f"Key verification failed for {redact_key_for_logging(api_key)}: {error_message}"
+        )
+        fail_count = key_manager.increment_key_failure_count(api_key)
+        if fail_count == 1:
+            logger.warning(
+                f"Bulk verification exception for key: {redact_key_for_logging(api_key)}, initializing failure count to 1"
+            )
+        else:
+            logger.warning(
+                f"Bulk verification exception for key: {redact_key_for_logging(api_key)}, incrementing failure count"
+            )
+        failed_keys[api_key] = {
+            "error_message": error_message,
+            "error_code": error_code,
+        }
+        return api_key, "invalid", error_message
+
     async def _verify_single_key(api_key: str):
         """内部函数，用于验证单个密钥并处理异常"""
         nonlocal successful_keys, failed_keys
         try:
-            gemini_request = GeminiRequest(
-                contents=[GeminiContent(role="user", parts=[{"text": "hi"}])],
-                generation_config={
-                    "temperature": 0.7,
-                    "topP": 1.0,
-                    "maxOutputTokens": 10,
-                },
-            )
-            await chat_service.generate_content(
-                settings.TEST_MODEL, gemini_request, api_key
+            # 单个密钥的验证设置超时，避免个别慢请求拖长整个批量验证
+            await asyncio.wait_for(
+                chat_service.generate_content(
+                    settings.TEST_MODEL, gemini_request, api_key
+                ),
+                timeout=KEY_VERIFY_TIMEOUT_SECONDS,
             )
             successful_keys.append(api_key)
             # 如果密钥验证成功，则重置其失败计数
             await key_manager.reset_key_failure_count(api_key)
             return api_key, "valid", None
-        except Exception as e:
-            error_message = e.args[1]
-            logger.warning(
-                f"Key verification failed for {redact_key_for_logging(api_key)}: {error_message}"
+        except asyncio.TimeoutError:
+            return _record_verification_failure(
+                api_key,
+                408,
+                f"Key verification timed out after {KEY_VERIFY_TIMEOUT_SECONDS}s",
             )
-            async with key_manager.failure_count_lock:
-                if api_key in key_manager.key_failure_counts:
-                    key_manager.key_failure_counts[api_key] += 1
-                    logger.warning(
-                        f"Bulk verification exception for key: {redact_key_for_logging(api_key)}, incrementing failure count"
-                    )
-                else:
-                    key_manager.key_failure_counts[api_key] = 1
-                    logger.warning(
-                        f"Bulk verification exception for key: {redact_key_for_logging(api_key)}, initializing failure count to 1"
-                    )
-            failed_keys[api_key] = {"error_message": e.args[1], "error_code": e.args[0]}
-            return api_key, "invalid", error_message
+        except Exception as e:
+            # 上游错误为 Exception(status_code, message)，其他异常（如连接错误）按 500 处理
+            if len(e.args) >= 2 and isinstance(e.args[0], int):
+                error_code, error_message = e.args[0], e.args[1]
+            else:
+                error_code, error_message = 500, str(e) or type(e).__name__
+            return _record_verification_failure(api_key, error_code, error_message)
+
+    # 限制并发验证数量，避免大量密钥同时请求上游触发限流
+    semaphore = asyncio.Semaphore(BULK_VERIFY_MAX_CONCURRENCY)
+
+    async def _verify_with_semaphore(api_key: str):
+        async with semaphore:
+            return await _verify_single_key(api_key)
 
-    tasks = [_verify_single_key(key) for key in keys_to_verify]
+    tasks = [_verify_with_semaphore(key) for key in keys_to_verify]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     for result in results:
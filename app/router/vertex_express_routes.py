@@ -1,3 +1,4 @@
+import logging
 from copy import deepcopy
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -105,7 +106,7 @@ async def list_models(
 
 
 @router.post("/models/{model_name}:generateContent")
-@RetryHandler(key_arg="api_key")
+@RetryHandler(key_arg="api_key", is_vertex=True)
 async def generate_content(
     model_name: str,
     request: GeminiRequest,
@@ -122,7 +123,8 @@ async def generate_content(
         logger.info(
             f"Handling Gemini content generation request for model: {model_name}"
         )
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -138,7 +140,7 @@ async def generate_content(
 
 
 @router.post("/models/{model_name}:streamGenerateContent")
-@RetryHandler(key_arg="api_key")
+@RetryHandler(key_arg="api_key", is_vertex=True)
 async def stream_generate_content(
     model_name: str,
     request: GeminiRequest,
@@ -155,7 +157,8 @@ async def stream_generate_content(
         logger.info(
             f"Handling Gemini streaming content generation for model: {model_name}"
         )
-        logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request: \n{request.model_dump_json(indent=2)}")
         logger.info(f"Using allowed token: {allowed_token}")
         logger.info(f"Using API key: {redact_key_for_logging(api_key)}")
 
@@ -33,13 +33,9 @@ async def check_failed_keys():
         chat_service = GeminiChatService(settings.BASE_URL, key_manager)
 
         # 获取需要检查的 key 列表 (失败次数 > 0)
-        keys_to_check = []
-        async with key_manager.failure_count_lock:  # 访问共享数据需要加锁
-            # 复制一份以避免在迭代时修改字典
-            failure_counts_copy = key_manager.key_failure_counts.copy()
-            keys_to_check = [
-                key for key, count in failure_counts_copy.items() if count > 0
-            ]  # 检查所有失败次数大于0的key
+        keys_to_check = [
+            key for key, count in key_manager.key_failure_counts.items() if count > 0
+        ]  # 检查所有失败次数大于0的key
 
         if not keys_to_check:
             logger.info("No keys with failure count > 0 found. Skipping verification.")
@@ -49,20 +45,21 @@ async def check_failed_keys():
             f"Found {len(keys_to_check)} keys with failure count > 0 to verify."
         )
 
+        # 构造测试请求，所有 key 共用
+        gemini_request = GeminiRequest(
+            contents=[
+                GeminiContent(
+                    role="user",
+                    parts=[{"text": "hi"}],
+                )
+            ]
+        )
+
         for key in keys_to_check:
             # 隐藏部分 key 用于日志记录
             log_key = redact_key_for_logging(key)
             logger.info(f"Verifying key: {log_key}...")
             try:
-                # 构造测试请求
-                gemini_request = GeminiRequest(
-                    contents=[
-                        GeminiContent(
-                            role="user",
-                            parts=[{"text": "hi"}],
-                        )
-                    ]
-                )
                 await chat_service.generate_content(
                     settings.TEST_MODEL, gemini_request, key
                 )
@@ -74,22 +71,20 @@ async def check_failed_keys():
                 logger.warning(
                     f"Key {log_key} verification failed: {str(e)}. Incrementing failure count."
                 )
-                # 直接操作计数器，需要加锁
-                async with key_manager.failure_count_lock:
-                    # 再次检查 key 是否存在且失败次数未达上限
-                    if (
-                        key in key_manager.key_failure_counts
-                        and key_manager.key_failure_counts[key]
-                        < key_manager.MAX_FAILURES
-                    ):
-                        key_manager.key_failure_counts[key] += 1
-                        logger.info(
-                            f"Failure count for key {log_key} incremented to {key_manager.key_failure_counts[key]}."
-                        )
-                    elif key in key_manager.key_failure_counts:
-                        logger.warning(
-                            f"Key {log_key} reached MAX_FAILURES ({key_manager.MAX_FAILURES}). Not incrementing further."
-                        )
+                # 再次检查 key 是否存在且失败次数未达上限
+                if (
+                    key in key_manager.key_failure_counts
+                    and key_manager.key_failure_counts[key]
+                    < key_manager.MAX_FAILURES
+                ):
+                    fail_count = key_manager.increment_key_failure_count(key)
+                    logger.info(
+                        f"Failure count for key {log_key} incremented to {fail_count}."
+                    )
+                elif key in key_manager.key_failure_counts:
+                    logger.warning(
+                        f"Key {log_key} reached MAX_FAILURES ({key_manager.MAX_FAILURES}). Not incrementing further."
+                    )
 
     except Exception as e:
         logger.error(
@@ -7,7 +7,10 @@ import time
 from typing import Any, AsyncGenerator, Dict, List
 
 from app.config.config import settings
-from app.core.constants import GEMINI_2_FLASH_EXP_SAFETY_SETTINGS
+from app.core.constants import (
+    GEMINI_2_FLASH_EXP_SAFETY_SETTINGS,
+    GEMINI_UNSUPPORTED_SCHEMA_FIELDS,
+)
 from app.database.services import add_error_log, add_request_log, get_file_api_key
 from app.domain.gemini_models import GeminiRequest
 from app.handler.response_handler import GeminiResponseHandler
@@ -22,12 +25,11 @@ logger = get_gemini_logger()
 
 def _has_image_parts(contents: List[Dict[str, Any]]) -> bool:
     """判断消息是否包含图片部分"""
-    for content in contents:
-        if "parts" in content:
-            for part in content["parts"]:
-                if "image_url" in part or "inline_data" in part:
-                    return True
-    return False
+    return any(
+        "image_url" in part or "inline_data" in part
+        for content in contents
+        for part in content.get("parts") or ()
+    )
 
 
 def _extract_file_references(contents: List[Dict[str, Any]]) -> List[str]:
@@ -61,33 +63,9 @@ def _clean_json_schema_properties(obj: Any) -> Any:
     if not isinstance(obj, dict):
         return obj
 
-    # Gemini API不支持的JSON Schema字段
-    unsupported_fields = {
-        "exclusiveMaximum",
-        "exclusiveMinimum",
-        "const",
-        "examples",
-        "contentEncoding",
-        "contentMediaType",
-        "if",
-        "then",
-        "else",
-        "allOf",
-        "anyOf",
-        "oneOf",
-        "not",
-        "definitions",
-        "$schema",
-        "$id",
-        "$ref",
-        "$comment",
-        "readOnly",
-        "writeOnly",
-    }
-
     cleaned = {}
     for key, value in obj.items():
-        if key in unsupported_fields:
+        if key in GEMINI_UNSUPPORTED_SCHEMA_FIELDS:
             continue
         if isinstance(value, dict):
             cleaned[key] = _clean_json_schema_properties(value)
@@ -336,8 +314,9 @@ class GeminiChatService:
         self, model: str, request: GeminiRequest, api_key: str
     ) -> Dict[str, Any]:
         """生成内容"""
+        payload = _build_payload(model, request)
         # 檢查並獲取文件專用的 API key（如果有文件）
-        file_names = _extract_file_references(request.model_dump().get("contents", []))
+        file_names = _extract_file_references(payload["contents"])
         if file_names:
             logger.info(f"Request contains file references: {file_names}")
             file_api_key = await get_file_api_key(file_names[0])
@@ -351,7 +330,6 @@ class GeminiChatService:
                     f"No API key found for file {file_names[0]}, using default key: {redact_key_for_logging(api_key)}"
                 )
 
-        payload = _build_payload(model, request)
         start_time = time.perf_counter()
         request_datetime = datetime.datetime.now()
         is_success = False
@@ -441,8 +419,9 @@ class GeminiChatService:
         self, model: str, request: GeminiRequest, api_key: str
     ) -> AsyncGenerator[str, None]:
         """流式生成内容"""
+        payload = _build_payload(model, request)
         # 檢查並獲取文件專用的 API key（如果有文件）
-        file_names = _extract_file_references(request.model_dump().get("contents", []))
+        file_names = _extract_file_references(payload["contents"])
         if file_names:
             logger.info(f"Request contains file references: {file_names}")
             file_api_key = await get_file_api_key(file_names[0])
@@ -458,7 +437,6 @@ class GeminiChatService:
 
         retries = 0
         max_retries = settings.MAX_RETRIES
-        payload = _build_payload(model, request)
         is_success = False
         status_code = None
         final_api_key = api_key
@@ -519,7 +497,7 @@ class GeminiChatService:
                 )
 
                 api_key = await self.key_manager.handle_api_failure(
-                    current_attempt_key, retries
+                    current_attempt_key, retries, status_code=status_code
                 )
                 if api_key:
                     logger.info(
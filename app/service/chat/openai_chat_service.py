@@ -3,12 +3,18 @@
 import asyncio
 import datetime
 import json
+import random
 import time
 from copy import deepcopy
 from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 
 from app.config.config import settings
-from app.core.constants import GEMINI_2_FLASH_EXP_SAFETY_SETTINGS
+from app.core.constants import (
+    GEMINI_2_FLASH_EXP_SAFETY_SETTINGS,
+    GEMINI_UNSUPPORTED_SCHEMA_FIELDS,
+    RETRY_BACKOFF_BASE_SECONDS,
+    RETRY_BACKOFF_MAX_SECONDS,
+)
 from app.database.services import (
     add_error_log,
     add_request_log,
@@ -27,12 +33,11 @@ logger = get_openai_logger()
 
 def _has_media_parts(messages: List[Dict[str, Any]]) -> bool:
     """判断消息是否包含多媒体部分"""
-    for message in messages:
-        if "parts" in message:
-            for part in message["parts"]:
-                if "image_url" in part or "inline_data" in part:
-                    return True
-    return False
+    return any(
+        "image_url" in part or "inline_data" in part
+        for message in messages
+        for part in message.get("parts") or ()
+    )
 
 
 def _clean_json_schema_properties(obj: Any) -> Any:
@@ -40,33 +45,9 @@ def _clean_json_schema_properties(obj: Any) -> Any:
     if not isinstance(obj, dict):
         return obj
 
-    # Gemini API不支持的JSON Schema字段
-    unsupported_fields = {
-        "exclusiveMaximum",
-        "exclusiveMinimum",
-        "const",
-        "examples",
-        "contentEncoding",
-        "contentMediaType",
-        "if",
-        "then",
-        "else",
-        "allOf",
-        "anyOf",
-        "oneOf",
-        "not",
-        "definitions",
-        "$schema",
-        "$id",
-        "$ref",
-        "$comment",
-        "readOnly",
-        "writeOnly",
-    }
-
     cleaned = {}
     for key, value in obj.items():
-        if key in unsupported_fields:
+        if key in GEMINI_UNSUPPORTED_SCHEMA_FIELDS:
             continue
         if isinstance(value, dict):
             cleaned[key] = _clean_json_schema_properties(value)
@@ -84,6 +65,7 @@ def _build_tools(
     """构建工具"""
     tool = dict()
     model = request.model
+    has_media_parts = _has_media_parts(messages)
 
     if (
         settings.TOOLS_CODE_EXECUTION_ENABLED
@@ -93,11 +75,11 @@ def _build_tools(
             or model.endswith("-image")
             or model.endswith("-image-generation")
         )
-        and not _has_media_parts(messages)
+        and not has_media_parts
     ):
         tool["codeExecution"] = {}
         logger.debug("Code execution tool enabled.")
-    elif _has_media_parts(messages):
+    elif has_media_parts:
         logger.debug("Code execution tool disabled due to media parts presence.")
 
     if model.endswith("-search"):
@@ -502,6 +484,18 @@ class OpenAIChatService:
         final_api_key = api_key
 
         while retries < max_retries:
+            if retries:
+                # 指数退避 + 全抖动，避免失败后立即连续请求上游
+                delay = random.uniform(
+                    0,
+                    min(
+                        RETRY_BACKOFF_MAX_SECONDS,
+                        RETRY_BACKOFF_BASE_SECONDS * 2**retries,
+                    ),
+                )
+                logger.info(f"Retrying stream in {delay:.2f}s (attempt {retries + 1})")
+                await asyncio.sleep(delay)
+
             start_time = time.perf_counter()
             request_datetime = datetime.datetime.now()
             current_attempt_key = final_api_key
@@ -557,7 +551,7 @@ class OpenAIChatService:
 
                 if self.key_manager:
                     new_api_key = await self.key_manager.handle_api_failure(
-                        current_attempt_key, retries
+                        current_attempt_key, retries, status_code=status_code
                     )
                     if new_api_key and new_api_key != current_attempt_key:
                         final_api_key = new_api_key
@@ -6,7 +6,10 @@ import time
 from typing import Any, AsyncGenerator, Dict, List
 
 from app.config.config import settings
-from app.core.constants import GEMINI_2_FLASH_EXP_SAFETY_SETTINGS
+from app.core.constants import (
+    GEMINI_2_FLASH_EXP_SAFETY_SETTINGS,
+    GEMINI_UNSUPPORTED_SCHEMA_FIELDS,
+)
 from app.database.services import add_error_log, add_request_log
 from app.domain.gemini_models import GeminiRequest
 from app.handler.response_handler import GeminiResponseHandler
@@ -21,12 +24,11 @@ logger = get_gemini_logger()
 
 def _has_image_parts(contents: List[Dict[str, Any]]) -> bool:
     """判断消息是否包含图片部分"""
-    for content in contents:
-        if "parts" in content:
-            for part in content["parts"]:
-                if "image_url" in part or "inline_data" in part:
-                    return True
-    return False
+    return any(
+        "image_url" in part or "inline_data" in part
+        for content in contents
+        for part in content.get("parts") or ()
+    )
 
 
 def _clean_json_schema_properties(obj: Any) -> Any:
@@ -34,33 +36,9 @@ def _clean_json_schema_properties(obj: Any) -> Any:
     if not isinstance(obj, dict):
         return obj
 
-    # Gemini API不支持的JSON Schema字段
-    unsupported_fields = {
-        "exclusiveMaximum",
-        "exclusiveMinimum",
-        "const",
-        "examples",
-        "contentEncoding",
-        "contentMediaType",
-        "if",
-        "then",
-        "else",
-        "allOf",
-        "anyOf",
-        "oneOf",
-        "not",
-        "definitions",
-        "$schema",
-        "$id",
-        "$ref",
-        "$comment",
-        "readOnly",
-        "writeOnly",
-    }
-
     cleaned = {}
     for key, value in obj.items():
-        if key in unsupported_fields:
+        if key in GEMINI_UNSUPPORTED_SCHEMA_FIELDS:
             continue
         if isinstance(value, dict):
             cleaned[key] = _clean_json_schema_properties(value)
@@ -369,8 +347,8 @@ class GeminiChatService:
                     request_datetime=request_datetime,
                 )
 
-                api_key = await self.key_manager.handle_api_failure(
-                    current_attempt_key, retries
+                api_key = await self.key_manager.handle_vertex_api_failure(
+                    current_attempt_key, retries, status_code=status_code
                 )
                 if api_key:
                     logger.info(
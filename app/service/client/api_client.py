@@ -7,11 +7,41 @@ from typing import Any, AsyncGenerator, Dict, Optional
 import httpx
 
 from app.config.config import settings
-from app.core.constants import DEFAULT_TIMEOUT
+from app.core.constants import (
+    DEFAULT_TIMEOUT,
+    HTTP_CLIENT_MAX_CONNECTIONS,
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+)
 from app.log.logger import get_api_client_logger
 
 logger = get_api_client_logger()
 
+# 按代理复用的 httpx 客户端，保持连接池与 keep-alive，避免每次请求重新握手
+_http_clients: Dict[Optional[str], httpx.AsyncClient] = {}
+
+
+def get_http_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """获取指定代理对应的共享 httpx 客户端"""
+    client = _http_clients.get(proxy)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            proxy=proxy,
+            limits=httpx.Limits(
+                max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        _http_clients[proxy] = client
+    return client
+
+
+async def close_http_clients():
+    """关闭所有共享的 httpx 客户端"""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
 
 class ApiClient(ABC):
     """API客户端基类"""
@@ -67,19 +97,19 @@ class GeminiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers()
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models?key={api_key}&pageSize=1000"
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"获取模型列表失败: {e.response.status_code}")
-                logger.error(e.response.text)
-                return None
-            except httpx.RequestError as e:
-                logger.error(f"请求模型列表失败: {e}")
-                return None
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models?key={api_key}&pageSize=1000"
+        try:
+            response = await client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"获取模型列表失败: {e.response.status_code}")
+            logger.error(e.response.text)
+            return None
+        except httpx.RequestError as e:
+            logger.error(f"请求模型列表失败: {e}")
+            return None
 
     async def generate_content(
         self, payload: Dict[str, Any], model: str, api_key: str
@@ -97,23 +127,25 @@ class GeminiApiClient(ApiClient):
 
         headers = self._prepare_headers()
 
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models/{model}:generateContent?key={api_key}"
-            response = await client.post(url, json=payload, headers=headers)
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models/{model}:generateContent?key={api_key}"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
 
-            if response.status_code != 200:
-                error_content = response.text
-                logger.error(
-                    f"API call failed - Status: {response.status_code}, Content: {error_content}"
-                )
-                raise Exception(response.status_code, error_content)
-            response_data = response.json()
+        if response.status_code != 200:
+            error_content = response.text
+            logger.error(
+                f"API call failed - Status: {response.status_code}, Content: {error_content}"
+            )
+            raise Exception(response.status_code, error_content)
+        response_data = response.json()
 
-            # 检查响应结构的基本信息
-            if not response_data.get("candidates"):
-                logger.warning("No candidates found in API response")
+        # 检查响应结构的基本信息
+        if not response_data.get("candidates"):
+            logger.warning("No candidates found in API response")
 
-            return response_data
+        return response_data
 
     async def stream_generate_content(
         self, payload: Dict[str, Any], model: str, api_key: str
@@ -130,17 +162,17 @@ class GeminiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers()
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
-            async with client.stream(
-                method="POST", url=url, json=payload, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    error_content = await response.aread()
-                    error_msg = error_content.decode("utf-8")
-                    raise Exception(response.status_code, error_msg)
-                async for line in response.aiter_lines():
-                    yield line
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
+        async with client.stream(
+            method="POST", url=url, json=payload, headers=headers, timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                error_content = await response.aread()
+                error_msg = error_content.decode("utf-8")
+                raise Exception(response.status_code, error_msg)
+            async for line in response.aiter_lines():
+                yield line
 
     async def count_tokens(
         self, payload: Dict[str, Any], model: str, api_key: str
@@ -157,13 +189,15 @@ class GeminiApiClient(ApiClient):
             logger.info(f"Using proxy for counting tokens: {proxy_to_use}")
 
         headers = self._prepare_headers()
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models/{model}:countTokens?key={api_key}"
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models/{model}:countTokens?key={api_key}"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
     async def embed_content(
         self, payload: Dict[str, Any], model: str, api_key: str
@@ -181,16 +215,18 @@ class GeminiApiClient(ApiClient):
             logger.info(f"Using proxy for embedding: {proxy_to_use}")
 
         headers = self._prepare_headers()
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models/{model}:embedContent?key={api_key}"
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                logger.error(
-                    f"Embedding API call failed - Status: {response.status_code}, Content: {error_content}"
-                )
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models/{model}:embedContent?key={api_key}"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            logger.error(
+                f"Embedding API call failed - Status: {response.status_code}, Content: {error_content}"
+            )
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
     async def batch_embed_contents(
         self, payload: Dict[str, Any], model: str, api_key: str
@@ -208,16 +244,18 @@ class GeminiApiClient(ApiClient):
             logger.info(f"Using proxy for batch embedding: {proxy_to_use}")
 
         headers = self._prepare_headers()
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/models/{model}:batchEmbedContents?key={api_key}"
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                logger.error(
-                    f"Batch embedding API call failed - Status: {response.status_code}, Content: {error_content}"
-                )
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/models/{model}:batchEmbedContents?key={api_key}"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            logger.error(
+                f"Batch embedding API call failed - Status: {response.status_code}, Content: {error_content}"
+            )
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
 
 class OpenaiApiClient(ApiClient):
@@ -246,13 +284,13 @@ class OpenaiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers(api_key)
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/openai/models"
-            response = await client.get(url, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/openai/models"
+        response = await client.get(url, headers=headers, timeout=timeout)
+        if response.status_code != 200:
+            error_content = response.text
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
     async def generate_content(
         self, payload: Dict[str, Any], api_key: str
@@ -270,13 +308,15 @@ class OpenaiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers(api_key)
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/openai/chat/completions"
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/openai/chat/completions"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
     async def stream_generate_content(
         self, payload: Dict[str, Any], api_key: str
@@ -291,17 +331,17 @@ class OpenaiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers(api_key)
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/openai/chat/completions"
-            async with client.stream(
-                method="POST", url=url, json=payload, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    error_content = await response.aread()
-                    error_msg = error_content.decode("utf-8")
-                    raise Exception(response.status_code, error_msg)
-                async for line in response.aiter_lines():
-                    yield line
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/openai/chat/completions"
+        async with client.stream(
+            method="POST", url=url, json=payload, headers=headers, timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                error_content = await response.aread()
+                error_msg = error_content.decode("utf-8")
+                raise Exception(response.status_code, error_msg)
+            async for line in response.aiter_lines():
+                yield line
 
     async def create_embeddings(
         self, input: str, model: str, api_key: str
@@ -317,17 +357,19 @@ class OpenaiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers(api_key)
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/openai/embeddings"
-            payload = {
-                "input": input,
-                "model": model,
-            }
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/openai/embeddings"
+        payload = {
+            "input": input,
+            "model": model,
+        }
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            raise Exception(response.status_code, error_content)
+        return response.json()
 
     async def generate_images(
         self, payload: Dict[str, Any], api_key: str
@@ -343,10 +385,12 @@ class OpenaiApiClient(ApiClient):
             logger.info(f"Using proxy for getting models: {proxy_to_use}")
 
         headers = self._prepare_headers(api_key)
-        async with httpx.AsyncClient(timeout=timeout, proxy=proxy_to_use) as client:
-            url = f"{self.base_url}/openai/images/generations"
-            response = await client.post(url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_content = response.text
-                raise Exception(response.status_code, error_content)
-            return response.json()
+        client = get_http_client(proxy_to_use)
+        url = f"{self.base_url}/openai/images/generations"
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=timeout
+        )
+        if response.status_code != 200:
+            error_content = response.text
+            raise Exception(response.status_code, error_content)
+        return response.json()
@@ -9,6 +9,7 @@ from openai.types import CreateEmbeddingResponse
 from app.config.config import settings
 from app.database.services import add_error_log, add_request_log
 from app.log.logger import get_embeddings_logger
+from app.service.client.api_client import get_http_client
 
 logger = get_embeddings_logger()
 
@@ -42,8 +43,13 @@ class EmbeddingService:
             }
 
         try:
-            client = openai.OpenAI(api_key=api_key, base_url=settings.BASE_URL)
-            response = client.embeddings.create(input=input_text, model=model)
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=settings.BASE_URL,
+                # 复用共享连接池，避免每次请求都重新建立 TCP/TLS 连接
+                http_client=get_http_client(),
+            )
+            response = await client.embeddings.create(input=input_text, model=model)
             is_success = True
             status_code = 200
             return response
@@ -1,138 +1,345 @@
 import asyncio
 import random
-from itertools import cycle
-from typing import Dict, Union
+import time
+from typing import Dict, Optional, Set, Tuple, Union
 
 from app.config.config import settings
+from app.core.constants import (
+    KEY_RATE_LIMIT_COOLDOWN_SECONDS,
+    KEY_REJECTED_STATUS_CODES,
+)
 from app.log.logger import get_key_manager_logger
 from app.utils.helpers import redact_key_for_logging
 
 logger = get_key_manager_logger()
 
 
+def _build_key_index(keys: list) -> Dict[str, int]:
+    """构建 key -> 首次出现位置 的索引"""
+    key_index: Dict[str, int] = {}
+    for idx, key in enumerate(keys):
+        key_index.setdefault(key, idx)
+    return key_index
+
+
+class _KeyPool:
+    """
+    一组 key 的轮询位置、失败计数、无效集合与限流冷却状态。
+
+    KeyManager 为普通 API key 和 Vertex Express API key 各持有一个实例。
+    所有状态只在事件循环内同步读写（中间没有 await），无需加锁。
+    """
+
+    def __init__(self, keys: list, max_failures: int, key_type: str):
+        self.keys = keys
+        self.key_type = key_type
+        self.key_index = _build_key_index(keys)
+        # 轮询位置：下一次 get_next 返回 keys[cursor]
+        self.cursor = 0
+        self.failure_counts: Dict[str, int] = dict.fromkeys(keys, 0)
+        # 失败次数已达上限的 key，随失败计数同步维护
+        self.invalid_keys: Set[str] = set()
+        # 被限流的 key -> 冷却结束时间（time.monotonic）
+        self.cooldowns: Dict[str, float] = {}
+        self._max_failures = max_failures
+        # 按状态分组的缓存 (valid, invalid, all)，失败计数变化时失效
+        self._status_cache: Optional[Tuple[dict, dict, dict]] = None
+
+    @property
+    def max_failures(self) -> int:
+        return self._max_failures
+
+    @max_failures.setter
+    def max_failures(self, value: int):
+        self._max_failures = value
+        self._status_cache = None
+        self.invalid_keys = {
+            key for key, count in self.failure_counts.items() if count >= value
+        }
+
+    def get_next(self) -> str:
+        """获取下一个 key"""
+        idx = self.cursor
+        key = self.keys[idx]
+        self.cursor = (idx + 1) % len(self.keys)
+        return key
+
+    def _is_cooling_down(self, key: str) -> bool:
+        """检查key是否仍处于限流冷却期，过期的冷却记录会被清除"""
+        until = self.cooldowns.get(key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self.cooldowns[key]
+            return False
+        return True
+
+    def is_valid(self, key: str) -> bool:
+        """检查key是否有效"""
+        return key not in self.invalid_keys and not self._is_cooling_down(key)
+
+    def get_next_working(self) -> str:
+        """获取下一可用的 key，全部不可用时返回轮询中的下一个 key"""
+        key_count = len(self.keys)
+        start = self.cursor
+        for offset in range(key_count):
+            idx = (start + offset) % key_count
+            key = self.keys[idx]
+            if self.is_valid(key):
+                self.cursor = (idx + 1) % key_count
+                return key
+
+        fallback_key = self.keys[start]
+        self.cursor = (start + 1) % key_count
+        return fallback_key
+
+    def record_failure(self, key: str, status_code: Optional[int] = None):
+        """
+        记录一次调用失败
+
+        429 限流时 key 进入冷却期，期满后自动恢复，不计入失败次数；
+        401/403 视为 key 失效，直接标记为无效；其他错误累加失败次数。
+        """
+        if status_code == 429:
+            self.cooldowns[key] = time.monotonic() + KEY_RATE_LIMIT_COOLDOWN_SECONDS
+            logger.warning(
+                f"{self.key_type} key {redact_key_for_logging(key)} is rate limited, cooling down for {KEY_RATE_LIMIT_COOLDOWN_SECONDS}s"
+            )
+        elif status_code in KEY_REJECTED_STATUS_CODES:
+            self._status_cache = None
+            self.failure_counts[key] = max(
+                self.failure_counts[key], self._max_failures
+            )
+            self.invalid_keys.add(key)
+            logger.warning(
+                f"{self.key_type} key {redact_key_for_logging(key)} was rejected with status {status_code}, marking it invalid"
+            )
+        else:
+            self._status_cache = None
+            self.failure_counts[key] += 1
+            if self.failure_counts[key] >= self._max_failures:
+                self.invalid_keys.add(key)
+                logger.warning(
+                    f"{self.key_type} key {redact_key_for_logging(key)} has failed {self._max_failures} times"
+                )
+
+    def increment_failure_count(self, key: str) -> int:
+        """增加指定key的失败计数，返回新的失败次数"""
+        self._status_cache = None
+        fail_count = self.failure_counts.get(key, 0) + 1
+        self.failure_counts[key] = fail_count
+        if fail_count >= self._max_failures:
+            self.invalid_keys.add(key)
+        return fail_count
+
+    def reset_failure_counts(self):
+        """重置所有key的失败计数"""
+        self._status_cache = None
+        for key in self.failure_counts:
+            self.failure_counts[key] = 0
+        self.invalid_keys.clear()
+        self.cooldowns.clear()
+
+    def reset_failure_count(self, key: str) -> bool:
+        """重置指定key的失败计数"""
+        if key in self.failure_counts:
+            self._status_cache = None
+            self.failure_counts[key] = 0
+            self.invalid_keys.discard(key)
+            self.cooldowns.pop(key, None)
+            logger.info(
+                f"Reset failure count for {self.key_type} key: {redact_key_for_logging(key)}"
+            )
+            return True
+        logger.warning(
+            f"Attempt to reset failure count for non-existent {self.key_type} key: {key}"
+        )
+        return False
+
+    def _get_status_groups(self) -> Tuple[dict, dict, dict]:
+        """按失败次数将 key 分为有效/无效两组，结果缓存至失败计数下次变化"""
+        if self._status_cache is None:
+            valid_keys = {}
+            invalid_keys = {}
+            all_keys = {}
+            for key in self.keys:
+                fail_count = self.failure_counts.get(key, 0)
+                all_keys[key] = fail_count
+                if fail_count < self._max_failures:
+                    valid_keys[key] = fail_count
+                else:
+                    invalid_keys[key] = fail_count
+            self._status_cache = (valid_keys, invalid_keys, all_keys)
+        return self._status_cache
+
+    def get_keys_by_status(self) -> dict:
+        """获取分类后的 key 列表，包括失败次数"""
+        valid_keys, invalid_keys, _ = self._get_status_groups()
+        return {"valid_keys": dict(valid_keys), "invalid_keys": dict(invalid_keys)}
+
+    def get_all_keys_with_fail_count(self) -> dict:
+        """获取所有 key 及其失败次数，并按状态分组"""
+        valid_keys, invalid_keys, all_keys = self._get_status_groups()
+        return {
+            "valid_keys": dict(valid_keys),
+            "invalid_keys": dict(invalid_keys),
+            "all_keys": dict(all_keys),
+        }
+
+    def inherit_state(self, old_pool: "_KeyPool"):
+        """
+        继承重置前旧 key 池的状态。
+
+        仍存在的 key 保留失败计数与限流冷却；轮询从旧池下一个 key 开始，
+        若该 key 已被移除，则顺延到旧列表中第一个仍存在的 key。
+        """
+        if old_pool.failure_counts:
+            self._status_cache = None
+            self.failure_counts = {
+                key: old_pool.failure_counts.get(key, 0) for key in self.keys
+            }
+            self.invalid_keys = {
+                key
+                for key, count in self.failure_counts.items()
+                if count >= self._max_failures
+            }
+            logger.info(
+                f"Inherited failure counts for applicable {self.key_type} keys."
+            )
+        self.cooldowns = {
+            key: until
+            for key, until in old_pool.cooldowns.items()
+            if key in self.key_index
+        }
+
+        old_keys = old_pool.keys
+        start_idx = None
+        if old_keys and self.keys:
+            for i in range(len(old_keys)):
+                key_candidate = old_keys[(old_pool.cursor + i) % len(old_keys)]
+                start_idx = self.key_index.get(key_candidate)
+                if start_idx is not None:
+                    break
+
+        if start_idx is None:
+            if self.keys:
+                logger.info(
+                    f"New {self.key_type} key cycle will start from the beginning of the new {self.key_type} key list (no specific start key determined or needed)."
+                )
+            else:
+                logger.info(
+                    f"New {self.key_type} key cycle not applicable as the new {self.key_type} key list is empty."
+                )
+            self.cursor = 0
+            return
+
+        logger.info(
+            f"{self.key_type} key cycle in new instance advanced. Next key will be: {redact_key_for_logging(self.keys[start_idx])}"
+        )
+        self.cursor = start_idx
+
+
 class KeyManager:
     def __init__(self, api_keys: list, vertex_api_keys: list):
-        self.api_keys = api_keys
-        self.vertex_api_keys = vertex_api_keys
-        self.key_cycle = cycle(api_keys)
-        self.vertex_key_cycle = cycle(vertex_api_keys)
-        self.key_cycle_lock = asyncio.Lock()
-        self.vertex_key_cycle_lock = asyncio.Lock()
-        self.failure_count_lock = asyncio.Lock()
-        self.vertex_failure_count_lock = asyncio.Lock()
-        self.key_failure_counts: Dict[str, int] = {key: 0 for key in api_keys}
-        self.vertex_key_failure_counts: Dict[str, int] = {
-            key: 0 for key in vertex_api_keys
-        }
-        self.MAX_FAILURES = settings.MAX_FAILURES
+        self._key_pool = _KeyPool(api_keys, settings.MAX_FAILURES, "API")
+        self._vertex_key_pool = _KeyPool(
+            vertex_api_keys, settings.MAX_FAILURES, "Vertex Express API"
+        )
         self.paid_key = settings.PAID_KEY
 
+    @property
+    def api_keys(self) -> list:
+        return self._key_pool.keys
+
+    @property
+    def vertex_api_keys(self) -> list:
+        return self._vertex_key_pool.keys
+
+    @property
+    def key_failure_counts(self) -> Dict[str, int]:
+        """只读，修改失败计数请使用 KeyManager 的方法"""
+        return self._key_pool.failure_counts
+
+    @property
+    def vertex_key_failure_counts(self) -> Dict[str, int]:
+        """只读，修改失败计数请使用 KeyManager 的方法"""
+        return self._vertex_key_pool.failure_counts
+
+    @property
+    def MAX_FAILURES(self) -> int:
+        return self._key_pool.max_failures
+
+    @MAX_FAILURES.setter
+    def MAX_FAILURES(self, value: int):
+        self._key_pool.max_failures = value
+        self._vertex_key_pool.max_failures = value
+
     async def get_paid_key(self) -> str:
         return self.paid_key
 
     async def get_next_key(self) -> str:
         """获取下一个API key"""
-        async with self.key_cycle_lock:
-            return next(self.key_cycle)
+        return self._key_pool.get_next()
 
     async def get_next_vertex_key(self) -> str:
         """获取下一个 Vertex Express API key"""
-        async with self.vertex_key_cycle_lock:
-            return next(self.vertex_key_cycle)
+        return self._vertex_key_pool.get_next()
 
     async def is_key_valid(self, key: str) -> bool:
         """检查key是否有效"""
-        async with self.failure_count_lock:
-            return self.key_failure_counts[key] < self.MAX_FAILURES
+        return self._key_pool.is_valid(key)
 
     async def is_vertex_key_valid(self, key: str) -> bool:
         """检查 Vertex key 是否有效"""
-        async with self.vertex_failure_count_lock:
-            return self.vertex_key_failure_counts[key] < self.MAX_FAILURES
+        return self._vertex_key_pool.is_valid(key)
 
     async def reset_failure_counts(self):
         """重置所有key的失败计数"""
-        async with self.failure_count_lock:
-            for key in self.key_failure_counts:
-                self.key_failure_counts[key] = 0
+        self._key_pool.reset_failure_counts()
 
     async def reset_vertex_failure_counts(self):
         """重置所有 Vertex key 的失败计数"""
-        async with self.vertex_failure_count_lock:
-            for key in self.vertex_key_failure_counts:
-                self.vertex_key_failure_counts[key] = 0
+        self._vertex_key_pool.reset_failure_counts()
 
     async def reset_key_failure_count(self, key: str) -> bool:
         """重置指定key的失败计数"""
-        async with self.failure_count_lock:
-            if key in self.key_failure_counts:
-                self.key_failure_counts[key] = 0
-                logger.info(f"Reset failure count for key: {redact_key_for_logging(key)}")
-                return True
-            logger.warning(
-                f"Attempt to reset failure count for non-existent key: {key}"
-            )
-            return False
+        return self._key_pool.reset_failure_count(key)
 
     async def reset_vertex_key_failure_count(self, key: str) -> bool:
         """重置指定 Vertex key 的失败计数"""
-        async with self.vertex_failure_count_lock:
-            if key in self.vertex_key_failure_counts:
-                self.vertex_key_failure_counts[key] = 0
-                logger.info(f"Reset failure count for Vertex key: {redact_key_for_logging(key)}")
-                return True
-            logger.warning(
-                f"Attempt to reset failure count for non-existent Vertex key: {key}"
-            )
-            return False
+        return self._vertex_key_pool.reset_failure_count(key)
 
     async def get_next_working_key(self) -> str:
         """获取下一可用的API key"""
-        initial_key = await self.get_next_key()
-        current_key = initial_key
-
-        while True:
-            if await self.is_key_valid(current_key):
-                return current_key
-
-            current_key = await self.get_next_key()
-            if current_key == initial_key:
-                return current_key
+        return self._key_pool.get_next_working()
 
     async def get_next_working_vertex_key(self) -> str:
         """获取下一可用的 Vertex Express API key"""
-        initial_key = await self.get_next_vertex_key()
-        current_key = initial_key
-
-        while True:
-            if await self.is_vertex_key_valid(current_key):
-                return current_key
-
-            current_key = await self.get_next_vertex_key()
-            if current_key == initial_key:
-                return current_key
-
-    async def handle_api_failure(self, api_key: str, retries: int) -> str:
-        """处理API调用失败"""
-        async with self.failure_count_lock:
-            self.key_failure_counts[api_key] += 1
-            if self.key_failure_counts[api_key] >= self.MAX_FAILURES:
-                logger.warning(
-                    f"API key {redact_key_for_logging(api_key)} has failed {self.MAX_FAILURES} times"
-                )
+        return self._vertex_key_pool.get_next_working()
+
+    async def handle_api_failure(
+        self, api_key: str, retries: int, status_code: Optional[int] = None
+    ) -> str:
+        """处理API调用失败，未超过重试次数时返回下一可用的 key"""
+        self._key_pool.record_failure(api_key, status_code)
         if retries < settings.MAX_RETRIES:
             return await self.get_next_working_key()
         else:
             return ""
 
-    async def handle_vertex_api_failure(self, api_key: str, retries: int) -> str:
-        """处理 Vertex Express API 调用失败"""
-        async with self.vertex_failure_count_lock:
-            self.vertex_key_failure_counts[api_key] += 1
-            if self.vertex_key_failure_counts[api_key] >= self.MAX_FAILURES:
-                logger.warning(
-                    f"Vertex Express API key {redact_key_for_logging(api_key)} has failed {self.MAX_FAILURES} times"
-                )
+    async def handle_vertex_api_failure(
+        self, api_key: str, retries: int, status_code: Optional[int] = None
+    ) -> str:
+        """处理 Vertex Express API 调用失败，未超过重试次数时返回下一可用的 Vertex key"""
+        self._vertex_key_pool.record_failure(api_key, status_code)
+        if retries < settings.MAX_RETRIES:
+            return await self.get_next_working_vertex_key()
+        else:
+            return ""
+
+    def increment_key_failure_count(self, key: str) -> int:
+        """增加指定key的失败计数，返回新的失败次数"""
+        return self._key_pool.increment_failure_count(key)
 
     def get_fail_count(self, key: str) -> int:
         """获取指定密钥的失败次数"""
@@ -144,51 +351,21 @@ class KeyManager:
 
     async def get_all_keys_with_fail_count(self) -> dict:
         """获取所有API key及其失败次数"""
-        all_keys = {}
-        async with self.failure_count_lock:
-            for key in self.api_keys:
-                all_keys[key] = self.key_failure_counts.get(key, 0)
-        
-        valid_keys = {k: v for k, v in all_keys.items() if v < self.MAX_FAILURES}
-        invalid_keys = {k: v for k, v in all_keys.items() if v >= self.MAX_FAILURES}
-        
-        return {"valid_keys": valid_keys, "invalid_keys": invalid_keys, "all_keys": all_keys}
+        return self._key_pool.get_all_keys_with_fail_count()
 
     async def get_keys_by_status(self) -> dict:
         """获取分类后的API key列表，包括失败次数"""
-        valid_keys = {}
-        invalid_keys = {}
-
-        async with self.failure_count_lock:
-            for key in self.api_keys:
-                fail_count = self.key_failure_counts[key]
-                if fail_count < self.MAX_FAILURES:
-                    valid_keys[key] = fail_count
-                else:
-                    invalid_keys[key] = fail_count
-
-        return {"valid_keys": valid_keys, "invalid_keys": invalid_keys}
+        return self._key_pool.get_keys_by_status()
 
     async def get_vertex_keys_by_status(self) -> dict:
         """获取分类后的 Vertex Express API key 列表，包括失败次数"""
-        valid_keys = {}
-        invalid_keys = {}
-
-        async with self.vertex_failure_count_lock:
-            for key in self.vertex_api_keys:
-                fail_count = self.vertex_key_failure_counts[key]
-                if fail_count < self.MAX_FAILURES:
-                    valid_keys[key] = fail_count
-                else:
-                    invalid_keys[key] = fail_count
-        return {"valid_keys": valid_keys, "invalid_keys": invalid_keys}
+        return self._vertex_key_pool.get_keys_by_status()
 
     async def get_first_valid_key(self) -> str:
         """获取第一个有效的API key"""
-        async with self.failure_count_lock:
-            for key in self.key_failure_counts:
-                if self.key_failure_counts[key] < self.MAX_FAILURES:
-                    return key
+        for key in self.key_failure_counts:
+            if self._key_pool.is_valid(key):
+                return key
         if self.api_keys:
             return self.api_keys[0]
         if not self.api_keys:
@@ -198,12 +375,10 @@ class KeyManager:
 
     async def get_random_valid_key(self) -> str:
         """获取随机的有效API key"""
-        valid_keys = []
-        async with self.failure_count_lock:
-            for key in self.key_failure_counts:
-                if self.key_failure_counts[key] < self.MAX_FAILURES:
-                    valid_keys.append(key)
-        
+        valid_keys = [
+            key for key in self.key_failure_counts if self._key_pool.is_valid(key)
+        ]
+
         if valid_keys:
             return random.choice(valid_keys)
         
@@ -218,12 +393,8 @@ class KeyManager:
 
 _singleton_instance = None
 _singleton_lock = asyncio.Lock()
-_preserved_failure_counts: Union[Dict[str, int], None] = None
-_preserved_vertex_failure_counts: Union[Dict[str, int], None] = None
-_preserved_old_api_keys_for_reset: Union[list, None] = None
-_preserved_vertex_old_api_keys_for_reset: Union[list, None] = None
-_preserved_next_key_in_cycle: Union[str, None] = None
-_preserved_vertex_next_key_in_cycle: Union[str, None] = None
+_preserved_key_pool: Union[_KeyPool, None] = None
+_preserved_vertex_key_pool: Union[_KeyPool, None] = None
 
 
 async def get_key_manager_instance(
@@ -236,7 +407,7 @@ async def get_key_manager_instance(
     如果已创建实例，则忽略 api_keys 参数，返回现有单例。
     如果在重置后调用，会尝试恢复之前的状态（失败计数、循环位置）。
     """
-    global _singleton_instance, _preserved_failure_counts, _preserved_vertex_failure_counts, _preserved_old_api_keys_for_reset, _preserved_vertex_old_api_keys_for_reset, _preserved_next_key_in_cycle, _preserved_vertex_next_key_in_cycle
+    global _singleton_instance, _preserved_key_pool, _preserved_vertex_key_pool
 
     async with _singleton_lock:
         if _singleton_instance is None:
@@ -263,170 +434,15 @@ async def get_key_manager_instance(
                 f"KeyManager instance created/re-created with {len(api_keys)} API keys and {len(vertex_api_keys)} Vertex Express API keys."
             )
 
-            # 1. 恢复失败计数
-            if _preserved_failure_counts:
-                current_failure_counts = {
-                    key: 0 for key in _singleton_instance.api_keys
-                }
-                for key, count in _preserved_failure_counts.items():
-                    if key in current_failure_counts:
-                        current_failure_counts[key] = count
-                _singleton_instance.key_failure_counts = current_failure_counts
-                logger.info("Inherited failure counts for applicable keys.")
-            _preserved_failure_counts = None
-
-            if _preserved_vertex_failure_counts:
-                current_vertex_failure_counts = {
-                    key: 0 for key in _singleton_instance.vertex_api_keys
-                }
-                for key, count in _preserved_vertex_failure_counts.items():
-                    if key in current_vertex_failure_counts:
-                        current_vertex_failure_counts[key] = count
-                _singleton_instance.vertex_key_failure_counts = (
-                    current_vertex_failure_counts
+            # 恢复失败计数、限流冷却与轮询位置
+            if _preserved_key_pool is not None:
+                _singleton_instance._key_pool.inherit_state(_preserved_key_pool)
+            if _preserved_vertex_key_pool is not None:
+                _singleton_instance._vertex_key_pool.inherit_state(
+                    _preserved_vertex_key_pool
                 )
-                logger.info("Inherited failure counts for applicable Vertex keys.")
-            _preserved_vertex_failure_counts = None
-
-            # 2. 调整 key_cycle 的起始点
-            start_key_for_new_cycle = None
-            if (
-                _preserved_old_api_keys_for_reset
-                and _preserved_next_key_in_cycle
-                and _singleton_instance.api_keys
-            ):
-                try:
-                    start_idx_in_old = _preserved_old_api_keys_for_reset.index(
-                        _preserved_next_key_in_cycle
-                    )
-
-                    for i in range(len(_preserved_old_api_keys_for_reset)):
-                        current_old_key_idx = (start_idx_in_old + i) % len(
-                            _preserved_old_api_keys_for_reset
-                        )
-                        key_candidate = _preserved_old_api_keys_for_reset[
-                            current_old_key_idx
-                        ]
-                        if key_candidate in _singleton_instance.api_keys:
-                            start_key_for_new_cycle = key_candidate
-                            break
-                except ValueError:
-                    logger.warning(
-                        f"Preserved next key '{_preserved_next_key_in_cycle}' not found in preserved old API keys. "
-                        "New cycle will start from the beginning of the new list."
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error determining start key for new cycle from preserved state: {e}. "
-                        "New cycle will start from the beginning."
-                    )
-
-            if start_key_for_new_cycle and _singleton_instance.api_keys:
-                try:
-                    target_idx = _singleton_instance.api_keys.index(
-                        start_key_for_new_cycle
-                    )
-                    for _ in range(target_idx):
-                        next(_singleton_instance.key_cycle)
-                    logger.info(
-                        f"Key cycle in new instance advanced. Next call to get_next_key() will yield: {start_key_for_new_cycle}"
-                    )
-                except ValueError:
-                    logger.warning(
-                        f"Determined start key '{start_key_for_new_cycle}' not found in new API keys during cycle advancement. "
-                        "New cycle will start from the beginning."
-                    )
-                except StopIteration:
-                    logger.error(
-                        "StopIteration while advancing key cycle, implies empty new API key list previously missed."
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error advancing new key cycle: {e}. Cycle will start from beginning."
-                    )
-            else:
-                if _singleton_instance.api_keys:
-                    logger.info(
-                        "New key cycle will start from the beginning of the new API key list (no specific start key determined or needed)."
-                    )
-                else:
-                    logger.info(
-                        "New key cycle not applicable as the new API key list is empty."
-                    )
-
-            # 清理所有保存的状态
-            _preserved_old_api_keys_for_reset = None
-            _preserved_next_key_in_cycle = None
-
-            # 3. 调整 vertex_key_cycle 的起始点
-            start_key_for_new_vertex_cycle = None
-            if (
-                _preserved_vertex_old_api_keys_for_reset
-                and _preserved_vertex_next_key_in_cycle
-                and _singleton_instance.vertex_api_keys
-            ):
-                try:
-                    start_idx_in_old = _preserved_vertex_old_api_keys_for_reset.index(
-                        _preserved_vertex_next_key_in_cycle
-                    )
-
-                    for i in range(len(_preserved_vertex_old_api_keys_for_reset)):
-                        current_old_key_idx = (start_idx_in_old + i) % len(
-                            _preserved_vertex_old_api_keys_for_reset
-                        )
-                        key_candidate = _preserved_vertex_old_api_keys_for_reset[
-                            current_old_key_idx
-                        ]
-                        if key_candidate in _singleton_instance.vertex_api_keys:
-                            start_key_for_new_vertex_cycle = key_candidate
-                            break
-                except ValueError:
-                    logger.warning(
-                        f"Preserved next key '{_preserved_vertex_next_key_in_cycle}' not found in preserved old Vertex Express API keys. "
-                        "New cycle will start from the beginning of the new list."
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error determining start key for new Vertex key cycle from preserved state: {e}. "
-                        "New cycle will start from the beginning."
-                    )
-
-            if start_key_for_new_vertex_cycle and _singleton_instance.vertex_api_keys:
-                try:
-                    target_idx = _singleton_instance.vertex_api_keys.index(
-                        start_key_for_new_vertex_cycle
-                    )
-                    for _ in range(target_idx):
-                        next(_singleton_instance.vertex_key_cycle)
-                    logger.info(
-                        f"Vertex key cycle in new instance advanced. Next call to get_next_vertex_key() will yield: {start_key_for_new_vertex_cycle}"
-                    )
-                except ValueError:
-                    logger.warning(
-                        f"Determined start key '{start_key_for_new_vertex_cycle}' not found in new Vertex Express API keys during cycle advancement. "
-                        "New cycle will start from the beginning."
-                    )
-                except StopIteration:
-                    logger.error(
-                        "StopIteration while advancing Vertex key cycle, implies empty new Vertex Express API key list previously missed."
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error advancing new Vertex key cycle: {e}. Cycle will start from beginning."
-                    )
-            else:
-                if _singleton_instance.vertex_api_keys:
-                    logger.info(
-                        "New Vertex key cycle will start from the beginning of the new Vertex Express API key list (no specific start key determined or needed)."
-                    )
-                else:
-                    logger.info(
-                        "New Vertex key cycle not applicable as the new Vertex Express API key list is empty."
-                    )
-
-            # 清理所有保存的状态
-            _preserved_vertex_old_api_keys_for_reset = None
-            _preserved_vertex_next_key_in_cycle = None
+            _preserved_key_pool = None
+            _preserved_vertex_key_pool = None
 
         return _singleton_instance
 
@@ -437,54 +453,13 @@ async def reset_key_manager_instance():
     将保存当前实例的状态（失败计数、旧 API keys、下一个 key 提示）
     以供下一次 get_key_manager_instance 调用时恢复。
     """
-    global _singleton_instance, _preserved_failure_counts, _preserved_vertex_failure_counts, _preserved_old_api_keys_for_reset, _preserved_vertex_old_api_keys_for_reset, _preserved_next_key_in_cycle, _preserved_vertex_next_key_in_cycle
+    global _singleton_instance, _preserved_key_pool, _preserved_vertex_key_pool
     async with _singleton_lock:
         if _singleton_instance:
-            # 1. 保存失败计数
-            _preserved_failure_counts = _singleton_instance.key_failure_counts.copy()
-            _preserved_vertex_failure_counts = (
-                _singleton_instance.vertex_key_failure_counts.copy()
-            )
-
-            # 2. 保存旧的 API keys 列表
-            _preserved_old_api_keys_for_reset = _singleton_instance.api_keys.copy()
-            _preserved_vertex_old_api_keys_for_reset = (
-                _singleton_instance.vertex_api_keys.copy()
-            )
-
-            # 3. 保存 key_cycle 的下一个 key 提示
-            try:
-                if _singleton_instance.api_keys:
-                    _preserved_next_key_in_cycle = (
-                        await _singleton_instance.get_next_key()
-                    )
-                else:
-                    _preserved_next_key_in_cycle = None
-            except StopIteration:
-                logger.warning(
-                    "Could not preserve next key hint: key cycle was empty or exhausted in old instance."
-                )
-                _preserved_next_key_in_cycle = None
-            except Exception as e:
-                logger.error(f"Error preserving next key hint during reset: {e}")
-                _preserved_next_key_in_cycle = None
-
-            # 4. 保存 vertex_key_cycle 的下一个 key 提示
-            try:
-                if _singleton_instance.vertex_api_keys:
-                    _preserved_vertex_next_key_in_cycle = (
-                        await _singleton_instance.get_next_vertex_key()
-                    )
-                else:
-                    _preserved_vertex_next_key_in_cycle = None
-            except StopIteration:
-                logger.warning(
-                    "Could not preserve next key hint: Vertex key cycle was empty or exhausted in old instance."
-                )
-                _preserved_vertex_next_key_in_cycle = None
-            except Exception as e:
-                logger.error(f"Error preserving next key hint during reset: {e}")
-                _preserved_vertex_next_key_in_cycle = None
+            # 旧实例即将被丢弃，直接移交 key 池引用而不复制。
+            # 保存的 key 池在恢复时只读，不得再原地修改。
+            _preserved_key_pool = _singleton_instance._key_pool
+            _preserved_vertex_key_pool = _singleton_instance._vertex_key_pool
 
             _singleton_instance = None
             logger.info(
@@ -44,13 +44,17 @@ class ModelService:
         self, gemini_models: Dict[str, Any]
     ) -> Dict[str, Any]:
         openai_format = {"object": "list", "data": [], "success": True}
+        created = int(datetime.now(timezone.utc).timestamp())
+        search_models = set(settings.SEARCH_MODELS)
+        image_models = set(settings.IMAGE_MODELS)
+        thinking_models = set(settings.THINKING_MODELS)
 
         for model in gemini_models.get("models", []):
             model_id = model["name"].split("/")[-1]
             openai_model = {
                 "id": model_id,
                 "object": "model",
-                "created": int(datetime.now(timezone.utc).timestamp()),
+                "created": created,
                 "owned_by": "google",
                 "permission": [],
                 "root": model["name"],
@@ -58,15 +62,15 @@ class ModelService:
             }
             openai_format["data"].append(openai_model)
 
-            if model_id in settings.SEARCH_MODELS:
+            if model_id in search_models:
                 search_model = openai_model.copy()
                 search_model["id"] = f"{model_id}-search"
                 openai_format["data"].append(search_model)
-            if model_id in settings.IMAGE_MODELS:
+            if model_id in image_models:
                 image_model = openai_model.copy()
                 image_model["id"] = f"{model_id}-image"
                 openai_format["data"].append(image_model)
-            if model_id in settings.THINKING_MODELS:
+            if model_id in thinking_models:
                 non_thinking_model = openai_model.copy()
                 non_thinking_model["id"] = f"{model_id}-non-thinking"
                 openai_format["data"].append(non_thinking_model)
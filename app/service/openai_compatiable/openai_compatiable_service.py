@@ -152,7 +152,7 @@ class OpenAICompatiableService:
 
                 if self.key_manager:
                     api_key = await self.key_manager.handle_api_failure(
-                        current_attempt_key, retries
+                        current_attempt_key, retries, status_code=status_code
                     )
                     if api_key:
                         logger.info(
@@ -42,6 +42,7 @@ async def check_for_updates() -> Tuple[bool, Optional[str], Optional[str]]:
     github_api_url = f"https://api.github.com/repos/{settings.GITHUB_REPO_OWNER}/{settings.GITHUB_REPO_NAME}/releases/latest"
     logger.debug(f"Checking for updates at URL: {github_api_url}")
 
+    latest_v_str = None
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
             headers = {
@@ -87,7 +88,7 @@ async def check_for_updates() -> Tuple[bool, Optional[str], Optional[str]]:
         logger.error(f"检查更新时发生网络错误: {e}")
         return False, None, "更新检查期间发生网络错误。"
     except version.InvalidVersion:
-        latest_v_str_for_log = latest_v_str if 'latest_v_str' in locals() else 'N/A'
+        latest_v_str_for_log = latest_v_str if latest_v_str is not None else 'N/A'
         logger.error(f"发现无效的版本格式。当前 (from {VERSION_FILE_PATH}): '{current_v}', 最新: '{latest_v_str_for_log}'")
         return False, None, "遇到无效的版本格式。"
     except Exception as e:
@@ -0,0 +1,187 @@
+"""
+Unit tests for KeyManager key rotation, failure handling and state preservation
+"""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from app.core.constants import KEY_RATE_LIMIT_COOLDOWN_SECONDS
+from app.service.key import key_manager as key_manager_module
+from app.service.key.key_manager import (
+    KeyManager,
+    get_key_manager_instance,
+    reset_key_manager_instance,
+)
+
+
+class TestKeyManagerReset(unittest.IsolatedAsyncioTestCase):
+    """Test cases for get_key_manager_instance / reset_key_manager_instance"""
+
+    async def asyncSetUp(self):
+        key_manager_module._singleton_instance = None
+
+    async def asyncTearDown(self):
+        await reset_key_manager_instance()
+        key_manager_module._singleton_instance = None
+        key_manager_module._preserved_key_pool = None
+        key_manager_module._preserved_vertex_key_pool = None
+
+    async def test_cycle_position_restored_after_reset(self):
+        """The new instance continues the rotation where the old one stopped"""
+        km = await get_key_manager_instance(["k1", "k2", "k3"], ["v1", "v2"])
+        self.assertEqual(await km.get_next_key(), "k1")
+        self.assertEqual(await km.get_next_vertex_key(), "v1")
+
+        await reset_key_manager_instance()
+        km = await get_key_manager_instance(["k1", "k2", "k3"], ["v1", "v2"])
+
+        # reset consumes the "next key" hint, so rotation resumes at it
+        self.assertEqual(await km.get_next_key(), "k2")
+        self.assertEqual(await km.get_next_key(), "k3")
+        self.assertEqual(await km.get_next_key(), "k1")
+        self.assertEqual(await km.get_next_vertex_key(), "v2")
+
+    async def test_cycle_skips_removed_keys_after_reset(self):
+        """If the hinted key was removed, rotation starts at the next surviving key"""
+        km = await get_key_manager_instance(["k1", "k2", "k3", "k4"], [])
+        await km.get_next_key()
+
+        await reset_key_manager_instance()
+        km = await get_key_manager_instance(["k4", "k1", "k3"], [])
+
+        self.assertEqual(await km.get_next_key(), "k3")
+        self.assertEqual(await km.get_next_key(), "k4")
+
+    async def test_failure_counts_inherited_for_surviving_keys(self):
+        """Failure counts carry over only for keys still present"""
+        km = await get_key_manager_instance(["k1", "k2"], ["v1"])
+        await km.handle_api_failure("k1", retries=99)
+        await km.handle_vertex_api_failure("v1", retries=99)
+
+        await reset_key_manager_instance()
+        km = await get_key_manager_instance(["k1", "k3"], ["v1"])
+
+        self.assertEqual(km.get_fail_count("k1"), 1)
+        self.assertEqual(km.get_fail_count("k2"), 0)
+        self.assertEqual(km.get_fail_count("k3"), 0)
+        self.assertEqual(km.get_vertex_fail_count("v1"), 1)
+
+
+class TestKeyManagerValidity(unittest.IsolatedAsyncioTestCase):
+    """Test cases for key validity tracking and working-key selection"""
+
+    async def test_working_key_skips_keys_at_max_failures(self):
+        """Keys that reached MAX_FAILURES are skipped until reset"""
+        km = KeyManager(["k1", "k2", "k3"], [])
+        km.MAX_FAILURES = 2
+        await km.handle_api_failure("k1", retries=99)
+        self.assertTrue(await km.is_key_valid("k1"))
+        await km.handle_api_failure("k1", retries=99)
+        self.assertFalse(await km.is_key_valid("k1"))
+
+        self.assertEqual(await km.get_next_working_key(), "k2")
+        self.assertEqual(await km.get_next_working_key(), "k3")
+        self.assertEqual(await km.get_next_working_key(), "k2")
+
+        await km.reset_key_failure_count("k1")
+        self.assertTrue(await km.is_key_valid("k1"))
+        self.assertEqual(await km.get_next_working_key(), "k3")
+        self.assertEqual(await km.get_next_working_key(), "k1")
+
+    async def test_working_key_falls_back_when_all_invalid(self):
+        """When every key is invalid the next key in rotation is returned"""
+        km = KeyManager(["k1", "k2"], [])
+        km.MAX_FAILURES = 1
+        km.increment_key_failure_count("k1")
+        km.increment_key_failure_count("k2")
+
+        self.assertEqual(await km.get_next_working_key(), "k1")
+
+        await km.reset_failure_counts()
+        self.assertTrue(await km.is_key_valid("k1"))
+        self.assertTrue(await km.is_key_valid("k2"))
+
+    async def test_keys_by_status_follows_failure_updates(self):
+        """Status grouping reflects failures and resets made after a query"""
+        km = KeyManager(["k1", "k2"], [])
+        km.MAX_FAILURES = 1
+        status = await km.get_keys_by_status()
+        self.assertEqual(status["valid_keys"], {"k1": 0, "k2": 0})
+        self.assertEqual(status["invalid_keys"], {})
+
+        await km.handle_api_failure("k2", retries=99)
+        status = await km.get_keys_by_status()
+        self.assertEqual(status["valid_keys"], {"k1": 0})
+        self.assertEqual(status["invalid_keys"], {"k2": 1})
+
+        await km.reset_key_failure_count("k2")
+        all_keys = await km.get_all_keys_with_fail_count()
+        self.assertEqual(all_keys["valid_keys"], {"k1": 0, "k2": 0})
+        self.assertEqual(all_keys["all_keys"], {"k1": 0, "k2": 0})
+
+
+class TestKeyManagerFailureClassification(unittest.IsolatedAsyncioTestCase):
+    """Test cases for status-code aware failure handling"""
+
+    async def test_rate_limited_key_cools_down_without_failure_count(self):
+        """A 429 puts the key on cooldown instead of counting a failure"""
+        km = KeyManager(["k1", "k2"], [])
+        await km.handle_api_failure("k1", retries=99, status_code=429)
+
+        self.assertEqual(km.get_fail_count("k1"), 0)
+        self.assertFalse(await km.is_key_valid("k1"))
+        self.assertEqual(await km.get_next_working_key(), "k2")
+        self.assertEqual(await km.get_next_working_key(), "k2")
+
+        with patch(
+            "app.service.key.key_manager.time.monotonic",
+            return_value=time.monotonic() + KEY_RATE_LIMIT_COOLDOWN_SECONDS + 1,
+        ):
+            self.assertTrue(await km.is_key_valid("k1"))
+
+    async def test_valid_key_helpers_skip_cooling_down_keys(self):
+        """get_first_valid_key / get_random_valid_key honour 429 cooldowns"""
+        km = KeyManager(["k1", "k2"], [])
+        await km.handle_api_failure("k1", retries=99, status_code=429)
+
+        self.assertEqual(await km.get_first_valid_key(), "k2")
+        for _ in range(10):
+            self.assertEqual(await km.get_random_valid_key(), "k2")
+
+    async def test_vertex_failure_rotates_within_vertex_pool(self):
+        """Vertex failures are recorded in, and rotate through, the Vertex pool"""
+        km = KeyManager(["g1", "g2"], ["v1", "v2"])
+        new_key = await km.handle_vertex_api_failure("v1", 1, status_code=429)
+
+        self.assertEqual(new_key, "v2")
+        self.assertFalse(await km.is_vertex_key_valid("v1"))
+        self.assertTrue(await km.is_key_valid("g1"))
+        self.assertEqual(
+            await km.handle_vertex_api_failure("v2", 99, status_code=500), ""
+        )
+
+    async def test_rejected_key_is_invalidated_immediately(self):
+        """A 401/403 marks the key invalid without waiting for MAX_FAILURES"""
+        km = KeyManager(["k1", "k2"], [])
+        km.MAX_FAILURES = 5
+        await km.handle_api_failure("k1", retries=99, status_code=403)
+
+        self.assertEqual(km.get_fail_count("k1"), 5)
+        self.assertFalse(await km.is_key_valid("k1"))
+
+        await km.reset_key_failure_count("k1")
+        self.assertTrue(await km.is_key_valid("k1"))
+
+    async def test_other_errors_count_towards_max_failures(self):
+        """Server errors keep incrementing the failure counter"""
+        km = KeyManager(["k1"], [])
+        km.MAX_FAILURES = 2
+        await km.handle_api_failure("k1", retries=99, status_code=500)
+        self.assertTrue(await km.is_key_valid("k1"))
+        await km.handle_api_failure("k1", retries=99, status_code=500)
+        self.assertFalse(await km.is_key_valid("k1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit tests for RetryHandler failure classification
+"""
+
+import logging
+import unittest
+
+from app.handler.error_handler import handle_route_errors
+from app.handler.retry_handler import RetryHandler
+from app.service.key.key_manager import KeyManager
+
+logger = logging.getLogger("test_retry_handler")
+
+
+def _make_route(status_code: int, is_vertex: bool = False):
+    """Build a decorated route that fails once with status_code, then succeeds"""
+    used_keys = []
+
+    @RetryHandler(key_arg="api_key", is_vertex=is_vertex)
+    async def route(api_key: str, key_manager: KeyManager):
+        async with handle_route_errors(logger, "test_route"):
+            used_keys.append(api_key)
+            if len(used_keys) == 1:
+                raise Exception(status_code, "upstream error")
+            return api_key
+
+    return route, used_keys
+
+
+class TestRetryHandlerStatusCode(unittest.IsolatedAsyncioTestCase):
+    """Upstream status codes survive handle_route_errors' HTTPException wrapping"""
+
+    async def test_rate_limited_key_cools_down_without_failure_count(self):
+        """A 429 raised inside handle_route_errors puts the key on cooldown"""
+        km = KeyManager(["k1", "k2"], [])
+        route, used_keys = _make_route(429)
+
+        self.assertEqual(await route(api_key="k1", key_manager=km), "k2")
+        self.assertEqual(used_keys, ["k1", "k2"])
+        self.assertEqual(km.get_fail_count("k1"), 0)
+        self.assertFalse(await km.is_key_valid("k1"))
+
+    async def test_rejected_key_is_invalidated_immediately(self):
+        """A 403 raised inside handle_route_errors invalidates the key"""
+        km = KeyManager(["k1", "k2"], [])
+        km.MAX_FAILURES = 5
+        route, _ = _make_route(403)
+
+        self.assertEqual(await route(api_key="k1", key_manager=km), "k2")
+        self.assertEqual(km.get_fail_count("k1"), 5)
+
+    async def test_vertex_route_rotates_vertex_keys(self):
+        """Vertex routes rotate within the Vertex key pool"""
+        km = KeyManager(["g1", "g2"], ["v1", "v2"])
+        route, used_keys = _make_route(429, is_vertex=True)
+
+        self.assertEqual(await route(api_key="v1", key_manager=km), "v2")
+        self.assertFalse(await km.is_vertex_key_valid("v1"))
+        self.assertTrue(await km.is_key_valid("g1"))
+
+
+if __name__ == "__main__":
+    unittest.main()